@@ -79,6 +79,37 @@ def generate_questions_from_summary(summary, num_questions=5, points_per_questio
     questions = response.choices[0].message.content.strip()
     return questions
 
+# Split the generated questions text into structured questions, parsed once per quiz
+def parse_questions(questions_text, question_type="short answer"):
+    """
+    Return a list of dicts with the full question block, its first line as
+    the prompt, and (for multiple choice) the non-empty option lines.
+    """
+    blocks = re.split(r'\n(?=\d+[\.\)])', questions_text.strip())
+    questions = []
+    for block in blocks:
+        block = block.strip()
+        if not block:
+            continue
+        lines = block.split("\n")
+        options = []
+        if question_type.lower() == "multiple choice":
+            options = [opt.strip() for opt in lines[1:] if opt.strip()]
+        questions.append({"text": block, "prompt": lines[0], "options": options})
+    return questions
+
+# Extract the numeric score from grading feedback and normalize its display text
+def score_feedback(feedback, max_points=10, question_type="short answer"):
+    if question_type.lower() in {"multiple choice", "true/false", "true or false"}:
+        # look for the "The grade is N." phrase
+        m = re.search(r"(?i)(?:The grade is|Grade:)\s*(\d+)", feedback)
+        score = int(m.group(1)) if m else 0
+        return score, f"{score}/{max_points} – {feedback}"
+    normalized = re.sub(r"(?i)(\d+)\s*out of\s*(\d+)", r"\1/\2", feedback)
+    m = re.search(r"(\d+)/(\d+)", normalized)
+    score = int(m.group(1)) if m else 0
+    return score, normalized
+
 # Step 5: Grading User's Response using AI
 
 # Function to grade the user's response using AI
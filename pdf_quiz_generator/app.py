@@ -7,11 +7,12 @@ from PDF_extractor import (
     generate_questions_from_summary,
     grade_answer,
     create_polished_pdf,
+    parse_questions,
+    score_feedback,
 )
 import tempfile
 import openai
 import os
-import re
 
 # --- Page Config ---
 st.set_page_config(page_title="PDF Summarizer & Quiz Generator", layout="centered")
@@ -45,6 +46,89 @@ else:
     client = openai.OpenAI(api_key=api_key)
 os.environ["OPENAI_API_KEY"] = api_key
 
+# --- Quiz State Helpers ---
+def reset_quiz_state(keep_summary=True):
+    # Widget keys are derived from the stored quiz, so no full session_state scan is needed
+    quiz = st.session_state.get("quiz")
+    if quiz:
+        for i, q in enumerate(quiz["questions"]):
+            st.session_state.pop(f"answer_{i}", None)
+            for j in range(len(q["options"])):
+                st.session_state.pop(f"answer_{i}_{j}", None)
+    keys = ["quiz", "questions_generated", "graded_all", "quiz_settings_locked", "num_q_input", "pts_q_input"]
+    if not keep_summary:
+        keys.append("summary")
+    for key in keys:
+        st.session_state.pop(key, None)
+
+
+def current_answer(i):
+    # Widget keys are the single source of truth for answers
+    quiz = st.session_state.quiz
+    if quiz["question_type"] == "Multiple Choice":
+        # join the ticked options into a single string so grading sees it
+        return ", ".join(
+            opt for j, opt in enumerate(quiz["questions"][i]["options"])
+            if st.session_state.get(f"answer_{i}_{j}", False)
+        )
+    return (st.session_state.get(f"answer_{i}") or "").strip()
+
+
+@st.fragment
+def render_question(i):
+    # Runs in isolation: interacting with one question only redraws this fragment
+    quiz = st.session_state.quiz
+    q = quiz["questions"][i]
+    q_type = quiz["question_type"]
+    readonly = st.session_state.get("graded_all", False)
+
+    if q_type == "Short Answer":
+        st.markdown(f"**Question {q['text']}**")
+        st.text_area("Your Answer:", key=f"answer_{i}", height=150, disabled=readonly)
+
+    elif q_type == "Multiple Choice":
+        st.markdown(f"**Question {q['prompt']}**")
+        for j, opt in enumerate(q["options"]):
+            st.checkbox(opt, key=f"answer_{i}_{j}", disabled=readonly)
+
+    else:  # True/False
+        st.markdown(f"**Question {q['prompt']}**")
+        st.radio("Select your answer:", ["True", "False"], key=f"answer_{i}", disabled=readonly)
+
+
+    # — show graded feedback for *this* question if available —
+    feedback = quiz["feedback"][i].strip()
+    if feedback:
+        st.markdown(feedback)
+
+
+@st.fragment
+def render_grading_panel(summary):
+    quiz = st.session_state.quiz
+    if st.button("📖 Grade All Questions", key="grade_all_button"):
+        answers = [current_answer(idx) for idx in range(len(quiz["questions"]))]
+        if any(not ans for ans in answers):
+            st.warning("Please answer all questions before grading.")
+            return
+        points = st.session_state.points_per_question
+        progress = st.progress(0.0)
+        for idx, q in enumerate(quiz["questions"]):
+            with st.spinner(f"Grading Q{idx+1}..."):
+                fb = grade_answer(
+                    q["text"],
+                    answers[idx],
+                    summary,
+                    points,
+                    question_type=quiz["question_type"]
+                )
+            quiz["scores"][idx], quiz["feedback"][idx] = score_feedback(
+                fb, points, question_type=quiz["question_type"]
+            )
+            progress.progress((idx + 1) / len(quiz["questions"]))
+        st.session_state.graded_all = True
+        # Full rerun so every question shows its feedback and the summary appears
+        st.rerun()
+
 # --- PDF Upload & Summary Reset ---
 if "summary" not in st.session_state:
     api_success = st.success("✅ API Key validated successfully! You can now upload your PDF.")
@@ -91,14 +175,7 @@ if not show_questions:
     col_backpage, col_quiz = st.columns([2, 1])
     with col_backpage:
         if st.button("🔄 Upload New PDF", key="reset_pdf"):
-            for key in [
-                "summary", "questions_generated", "questions_text", "graded_all",
-                "quiz_settings_locked", "num_q_input", "pts_q_input"
-            ]:
-                st.session_state.pop(key, None)
-            for k in list(st.session_state.keys()):
-                if k.startswith("answer_") or k.startswith("feedback_"):
-                    st.session_state.pop(k, None)
+            reset_quiz_state(keep_summary=False)
             st.rerun()
     with col_quiz:
         st.download_button(
@@ -136,113 +213,36 @@ else:
                 st.error("Please enter valid integers.")
                 st.stop()
     else:
-        # Generate Questions
-        if "questions_text" not in st.session_state:
+        # Generate and parse questions once per quiz
+        if "quiz" not in st.session_state:
+            q_type = st.session_state.get("question_type")
             with st.spinner("Generating questions..."):
                 qt = generate_questions_from_summary(
                     summary,
                     num_questions=st.session_state.num_questions,
                     points_per_question=st.session_state.points_per_question,
-                    question_type=st.session_state.get("question_type")
+                    question_type=q_type
                 )
-                st.session_state.questions_text = qt
-        # Parse into blocks
-        raw_qt = st.session_state.questions_text.strip()
-        blocks = re.split(r'\n(?=\d+[\.\)])', raw_qt)
-        questions = [blk.strip() for blk in blocks if blk.strip()]
+            questions = parse_questions(qt, question_type=q_type)
+            st.session_state.quiz = {
+                "question_type": q_type,
+                "questions": questions,
+                "feedback": [""] * len(questions),
+                "scores": [0] * len(questions),
+            }
 
         st.subheader("🧠 Questions")
-        readonly = st.session_state.get("graded_all", False)
-
-        for i, block in enumerate(questions):
-            st.session_state.setdefault(f"feedback_{i}", "")
-            q_type = st.session_state.get("question_type")
-
-            # question text
-            if q_type == "Short Answer":
-                st.markdown(f"**Question {block}**")
-                st.session_state.setdefault(f"answer_{i}", "")
-                st.text_area("Your Answer:", key=f"answer_{i}", height=150, disabled=readonly)
-
-            elif q_type == "Multiple Choice":
-                lines = block.split("\n")
-                st.markdown(f"**Question {lines[0]}**")
-                selected = []
-                for j, opt in enumerate(lines[1:]):
-                    opt = opt.strip()
-                    if not opt:
-                        continue
-                    key_opt = f"answer_{i}_{j}"
-                    if st.checkbox(opt, key=key_opt, disabled=readonly):
-                        selected.append(opt)
-                # store as a single string so grading sees it
-                st.session_state[f"answer_{i}"] = ", ".join(selected)
-
-            else:  # True/False
-                lines = block.split("\n")
-                st.markdown(f"**Question {lines[0]}**")
-                st.radio("Select your answer:", ["True", "False"], key=f"answer_{i}", disabled=readonly)
+        for i in range(len(st.session_state.quiz["questions"])):
+            render_question(i)
 
-            # — show graded feedback for *this* question if available —
-            feedback = st.session_state.get(f"feedback_{i}", "").strip()
-            if feedback:
-                st.markdown(feedback)
-
-        # Grading logic remains unchanged...
-        st.session_state.setdefault("grading_all", False)
-        st.session_state.setdefault("grading_index", 0)
-        if not st.session_state.get("graded_all") and not st.session_state.get("grading_all"):
-            if st.button("📖 Grade All Questions", key="grade_all_button"):
-                missing = [
-                    idx for idx in range(len(questions))
-                    if not st.session_state.get(f"answer_{idx}", "").strip()
-                ]
-                if missing:
-                    st.warning("Please answer all questions before grading.")
-                else:
-                    for idx in range(len(questions)):
-                        st.session_state.pop(f"feedback_{idx}", None)
-                    st.session_state.grading_all = True
-                    st.session_state.grading_index = 0
-                    st.rerun()
-        if st.session_state.get("grading_all"):
-            idx = st.session_state.grading_index
-            ques = questions[idx]
-            ans = st.session_state.get(f"answer_{idx}", "").strip()
-            with st.spinner(f"Grading Q{idx+1}..."):
-                fb = grade_answer(
-                    ques,
-                    ans,
-                    summary,
-                    st.session_state.points_per_question,
-                    question_type=st.session_state.get("question_type")
-                )
-            q_type = st.session_state.get("question_type")
-            if q_type in ("Multiple Choice", "True/False"):
-                # look for the “The grade is N.” phrase
-                m = re.search(r"(?i)(?:The grade is|Grade:)\s*(\d+)", fb)
-                score = int(m.group(1)) if m else 0
-                fb_norm = f"{score}/{st.session_state.points_per_question} – {fb}"
-            else:
-                fb_norm = re.sub(r"(?i)(\d+)\s*out of\s*(\d+)", r"\1/\2", fb)
-            st.session_state[f"feedback_{idx}"] = fb_norm
-            st.markdown(fb_norm)
-            st.session_state.grading_index += 1
-            if st.session_state.grading_index >= len(questions):
-                st.session_state.grading_all = False
-                st.session_state.graded_all = True
-            st.rerun()
-            
+        if not st.session_state.get("graded_all"):
+            render_grading_panel(summary)
 
     # Quiz Summary & Navigation
     if st.session_state.get("graded_all", False):
-        total_score = 0
-        total_possible = st.session_state.num_questions * st.session_state.points_per_question
-        for i in range(st.session_state.num_questions):
-            fb = st.session_state.get(f"feedback_{i}", "")
-            match = re.search(r"(\d+)/(\d+)", fb)
-            if match:
-                total_score += int(match.group(1))
+        quiz = st.session_state.quiz
+        total_score = sum(quiz["scores"])
+        total_possible = len(quiz["questions"]) * st.session_state.points_per_question
         percentage = (total_score / total_possible) * 100 if total_possible > 0 else 0
         letter = "A" if percentage >= 90 else "B" if percentage >= 80 else "C" if percentage >= 70 else "D" if percentage >= 60 else "F"
         st.subheader("🎉 Quiz Summary")
@@ -252,23 +252,9 @@ else:
         col_back, col_newpdf = st.columns([2, 1])
         with col_back:
             if st.button("🔙 Back to Summary", key="back_to_summary"):
-                for key in [
-                    "questions_generated", "questions_text", "graded_all",
-                    "quiz_settings_locked", "num_q_input", "pts_q_input"
-                ]:
-                    st.session_state.pop(key, None)
-                for k in list(st.session_state.keys()):
-                    if k.startswith("answer_") or k.startswith("feedback_"):
-                        st.session_state.pop(k, None)
+                reset_quiz_state()
                 st.rerun()
         with col_newpdf:
             if st.button("🔄 Upload New PDF", key="reset_pdf_from_quiz"):
-                for key in [
-                    "summary", "questions_generated", "questions_text", "graded_all",
-                    "quiz_settings_locked", "num_q_input", "pts_q_input"
-                ]:
-                    st.session_state.pop(key, None)
-                for k in list(st.session_state.keys()):
-                    if k.startswith("answer_") or k.startswith("feedback_"):
-                        st.session_state.pop(k, None)
+                reset_quiz_state(keep_summary=False)
                 st.rerun()
@@ -18,7 +18,7 @@ setup(
     packages=find_packages(),
     include_package_data=True,
     install_requires=[
-        'streamlit>=1.0',
+        'streamlit>=1.37',
         'pymupdf',         # fitz binding
         'reportlab',
         'openai',
@@ -28,7 +28,7 @@ setup(
             'pdf-quiz=pdf_quiz_generator.cli:main',
         ],
     },
-    python_requires='>=3.7',
+    python_requires='>=3.8',
     classifiers=[
         'Programming Language :: Python :: 3',
         'Framework :: Streamlit',
@@ -15,6 +15,8 @@ from pdf_quiz_generator.PDF_extractor import (
     generate_questions_from_summary,
     grade_answer,
     create_polished_pdf,
+    parse_questions,
+    score_feedback,
 )
 
 # Helper: create a simple PDF in memory
@@ -72,3 +74,40 @@ def test_create_polished_pdf_returns_buffer():
     data = buf.getvalue()
     # PDF files start with '%PDF'
     assert data[:4] == b"%PDF"
+
+
+def test_parse_questions_multiple_choice():
+    text = "1. First?\nA) yes\n\nB) no\n2) Second?\nA) up\nB) down"
+    questions = parse_questions(text, question_type="Multiple Choice")
+    assert len(questions) == 2
+    assert questions[0]["prompt"] == "1. First?"
+    assert questions[0]["options"] == ["A) yes", "B) no"]
+    assert questions[1]["text"] == "2) Second?\nA) up\nB) down"
+
+
+def test_parse_questions_short_answer_has_no_options():
+    questions = parse_questions("1. Why?\n\n2. How?", question_type="Short Answer")
+    assert [q["prompt"] for q in questions] == ["1. Why?", "2. How?"]
+    assert all(q["options"] == [] for q in questions)
+
+
+def test_score_feedback_short_answer():
+    score, text = score_feedback("Grade: 7 out of 10. Good work.", max_points=10)
+    assert score == 7
+    assert "7/10" in text
+
+
+def test_score_feedback_true_false():
+    score, text = score_feedback("The grade is 5. Correct!", max_points=5, question_type="True/False")
+    assert score == 5
+    assert text.startswith("5/5")
+
+
+def test_parse_questions_empty_text():
+    assert parse_questions("") == []
+
+
+def test_score_feedback_multiple_choice_without_grade():
+    score, text = score_feedback("Incorrect, the answer is B.", max_points=5, question_type="Multiple Choice")
+    assert score == 0
+    assert text.startswith("0/5")